@@ -4,6 +4,10 @@
 
 CREATE SCHEMA IF NOT EXISTS clambake;
 
+-- Trigram matching lets the recall --search ILIKE '%...%' queries use
+-- GIN indexes instead of scanning every memory row
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- ============================================================
 -- 1. INSTANCES — Who's alive and what they're working on
 -- ============================================================
@@ -48,6 +52,20 @@ CREATE INDEX IF NOT EXISTS idx_messages_to_unread
 CREATE INDEX IF NOT EXISTS idx_messages_created
     ON clambake.messages (created_at DESC);
 
+-- Push delivery for new messages (used by 'clambake inbox --wait').
+-- Channels: inbox_<instance_id>, inbox_<project>, inbox_@all
+CREATE OR REPLACE FUNCTION clambake.notify_message() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('inbox_' || NEW.to_target, NEW.id::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_messages_notify ON clambake.messages;
+CREATE TRIGGER trg_messages_notify
+    AFTER INSERT ON clambake.messages
+    FOR EACH ROW EXECUTE FUNCTION clambake.notify_message();
+
 -- ============================================================
 -- 3. PROJECT_MEMORY — Per-project knowledge base
 -- ============================================================
@@ -88,6 +106,18 @@ CREATE INDEX IF NOT EXISTS idx_project_memory_status
 CREATE INDEX IF NOT EXISTS idx_project_memory_tags
     ON clambake.project_memory USING GIN (tags);
 
+-- Lets migrate_markdown.py re-run with ON CONFLICT DO NOTHING
+CREATE UNIQUE INDEX IF NOT EXISTS uq_project_memory_migration
+    ON clambake.project_memory (project, title)
+    WHERE created_by = 'migration';
+
+-- Index-backed substring search for recall --search
+CREATE INDEX IF NOT EXISTS idx_project_memory_title_trgm
+    ON clambake.project_memory USING GIN (title gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_project_memory_content_trgm
+    ON clambake.project_memory USING GIN (content gin_trgm_ops);
+
 -- HNSW index for semantic search (only if embeddings are populated)
 -- CREATE INDEX IF NOT EXISTS idx_project_memory_embedding
 --     ON clambake.project_memory USING hnsw (embedding vector_cosine_ops);
@@ -117,6 +147,17 @@ CREATE TABLE IF NOT EXISTS clambake.global_memory (
 CREATE INDEX IF NOT EXISTS idx_global_memory_type
     ON clambake.global_memory (memory_type);
 
+-- Lets migrate_markdown.py re-run with ON CONFLICT DO NOTHING
+CREATE UNIQUE INDEX IF NOT EXISTS uq_global_memory_migration
+    ON clambake.global_memory (title)
+    WHERE created_by = 'migration';
+
+CREATE INDEX IF NOT EXISTS idx_global_memory_title_trgm
+    ON clambake.global_memory USING GIN (title gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_global_memory_content_trgm
+    ON clambake.global_memory USING GIN (content gin_trgm_ops);
+
 -- ============================================================
 -- 5. SESSION_LOG — Audit trail of what happened
 -- ============================================================
@@ -146,6 +187,10 @@ CREATE INDEX IF NOT EXISTS idx_session_log_project
 CREATE INDEX IF NOT EXISTS idx_session_log_instance
     ON clambake.session_log (instance_id, created_at DESC);
 
+-- Backs the "latest N actions" query in 'clambake status'
+CREATE INDEX IF NOT EXISTS idx_session_log_created_at
+    ON clambake.session_log (created_at DESC);
+
 -- ============================================================
 -- VIEWS — Convenience queries
 -- ============================================================
@@ -224,6 +269,10 @@ CREATE INDEX IF NOT EXISTS idx_tasks_project
 CREATE INDEX IF NOT EXISTS idx_tasks_assigned
     ON clambake.tasks (assigned_instance) WHERE assigned_instance IS NOT NULL;
 
+-- Backs the ordered, keyset-paginated listing in 'clambake task-list'
+CREATE INDEX IF NOT EXISTS idx_tasks_list
+    ON clambake.tasks (project, status, priority DESC, created_at ASC);
+
 -- View: available tasks (pending, dependencies met)
 CREATE OR REPLACE VIEW clambake.available_tasks AS
 SELECT t.*